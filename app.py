@@ -1,24 +1,49 @@
 import os
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request
 import numpy as np
 import json
+import orjson
 import logging
-import copy
 import re
+import functools
+import mmap
+import io
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
 
 
 # 尝试导入pypower，如果不存在则提供说明
 try:
     import pypower.api as pp
     from pypower import case9, case14, case30, case39, case57, case118
+    from fast_pf import runpf_fast, NUMBA_AVAILABLE
     
     PYPOWER_AVAILABLE = True
 except ImportError:
     PYPOWER_AVAILABLE = False
+    NUMBA_AVAILABLE = False
     print("警告: pypower库未安装，请使用 pip install pypower 安装")
 
 app = Flask(__name__)
 
+# 使用orjson序列化JSON响应（C实现，可直接序列化numpy数值）
+def fast_jsonify(obj):
+    return Response(orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY), mimetype='application/json')
+
+# 节点数达到该规模且numba可用时使用稀疏牛顿法（fast_pf），小系统仍交给PyPower
+# （未安装numba时雅可比矩阵逐元素填充是纯Python循环，反而比PyPower慢）
+FAST_PF_MIN_BUSES = 30
+
+# 单次潮流计算请求的最长等待时间（秒）
+# 已开始执行的计算无法取消，超时后该进程池不再接收新请求（由新进程池接替），
+# 超时的计算在原工作进程中算完后进程退出，期间进程数可能暂时超过PF_POOL_WORKERS
+PF_TIMEOUT = 30
+
+# 潮流计算进程池的工作进程数（gunicorn每个worker各有一个进程池，默认不超过4个）
+PF_POOL_WORKERS = int(os.environ.get('PF_POOL_WORKERS', min(4, os.cpu_count() or 1)))
+
 # 创建数据目录（如果不存在）
 DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
 if not os.path.exists(DATA_DIR):
@@ -28,152 +53,147 @@ if not os.path.exists(DATA_DIR):
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# MATPOWER数据块正则（模块级预编译，避免每次解析重复编译）
+# 文件以内存映射方式读取，数据块正则直接匹配字节内容
+_BASE_MVA_RE = re.compile(rb'mpc\.baseMVA\s*=\s*(\d+(?:\.\d+)?)')
+_BUS_RE = re.compile(rb'mpc\.bus\s*=\s*\[(.*?)\];', re.DOTALL)
+_GEN_RE = re.compile(rb'mpc\.gen\s*=\s*\[(.*?)\];', re.DOTALL)
+_BRANCH_RE = re.compile(rb'mpc\.branch\s*=\s*\[(.*?)\];', re.DOTALL)
+_COORDS_RE = re.compile(rb'mpc\.bus_coords\s*=\s*\[(.*?)\];', re.DOTALL)
+_FUNCTION_BODY_RE = re.compile(rb'function mpc =[^\n]*\n?(.*?)(?:^[ \t]*end|\Z)', re.DOTALL | re.MULTILINE)
+_COMMENT_RE = re.compile(r'%[^\n]*')
+
+def _parse_matrix_block(match):
+    """将MATPOWER矩阵块解析为二维数组"""
+    if not match:
+        return np.array([])
+    # 只解码匹配到的数据块，先去掉注释（注释中可能含分号），再把行分隔符分号换成换行，
+    # 同一行写多行数据时也逐行解析；空行和行尾多余的分号由np.loadtxt忽略
+    text = _COMMENT_RE.sub('', match.group(1).decode('utf-8')).replace(';', '\n')
+    # 没有数据（空块或只有注释）时直接返回，避免loadtxt给出空输入警告
+    if not text.strip():
+        return np.array([])
+    return np.loadtxt(io.StringIO(text), ndmin=2)
+
 # 解析MATPOWER格式文件
 def parse_matpower_file(file_path):
-    """解析MATPOWER格式的.m文件"""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # 如果是函数格式，提取函数体内容
-    if 'function mpc =' in content:
-        # 移除函数定义行，只处理函数体
-        lines = content.split('\n')
-        function_body = []
-        in_function = False
-        for line in lines:
-            if 'function mpc =' in line:
-                in_function = True
-                continue
-            elif in_function and line.strip().startswith('end'):
-                break
-            elif in_function:
-                function_body.append(line)
-        content = '\n'.join(function_body)
+    """解析MATPOWER格式的.m文件（按文件修改时间缓存解析结果）"""
+    return _parse_matpower_cached(file_path, os.path.getmtime(file_path))
+
+@functools.lru_cache(maxsize=32)
+def _parse_matpower_cached(file_path, mtime):
+    """解析MATPOWER格式的.m文件，mtime参与缓存键，文件修改后自动失效"""
+    with open(file_path, 'rb') as f:
+        # 空文件无法建立内存映射
+        if os.fstat(f.fileno()).st_size == 0:
+            return _parse_matpower_content(b'')
+        # 内存映射文件，正则直接在映射内容上匹配，不整体读入内存
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            return _parse_matpower_content(content)
+
+def _parse_matpower_content(content):
+    """从MATPOWER文件内容（bytes或mmap）中提取各数据块"""
+    # 如果是函数格式，只在函数体范围内（函数定义行之后、end之前）查找
+    pos, endpos = 0, len(content)
+    function_match = _FUNCTION_BODY_RE.search(content)
+    if function_match:
+        pos, endpos = function_match.span(1)
     
     # 提取baseMVA
-    baseMVA_match = re.search(r'mpc\.baseMVA\s*=\s*(\d+(?:\.\d+)?)', content)
+    baseMVA_match = _BASE_MVA_RE.search(content, pos, endpos)
     baseMVA = float(baseMVA_match.group(1)) if baseMVA_match else 100.0
     
-    # 提取bus数据
-    bus_match = re.search(r'mpc\.bus\s*=\s*\[(.*?)\];', content, re.DOTALL)
-    bus_data = []
-    if bus_match:
-        for line in bus_match.group(1).strip().split('\n'):
-            line = line.strip()
-            if line and not line.startswith('%'):
-                values = [float(x) for x in line.split()]
-                bus_data.append(values)
-    
-    # 提取gen数据
-    gen_match = re.search(r'mpc\.gen\s*=\s*\[(.*?)\];', content, re.DOTALL)
-    gen_data = []
-    if gen_match:
-        for line in gen_match.group(1).strip().split('\n'):
-            line = line.strip()
-            if line and not line.startswith('%'):
-                values = [float(x) for x in line.split()]
-                gen_data.append(values)
-    
-    # 提取branch数据
-    branch_match = re.search(r'mpc\.branch\s*=\s*\[(.*?)\];', content, re.DOTALL)
-    branch_data = []
-    if branch_match:
-        for line in branch_match.group(1).strip().split('\n'):
-            line = line.strip()
-            if line and not line.startswith('%'):
-                values = [float(x) for x in line.split()]
-                branch_data.append(values)
+    # 提取bus、gen、branch数据
+    bus_data = _parse_matrix_block(_BUS_RE.search(content, pos, endpos))
+    gen_data = _parse_matrix_block(_GEN_RE.search(content, pos, endpos))
+    branch_data = _parse_matrix_block(_BRANCH_RE.search(content, pos, endpos))
     
     # 提取bus坐标（自定义扩展）
-    coords_match = re.search(r'mpc\.bus_coords\s*=\s*\[(.*?)\];', content, re.DOTALL)
-    bus_coords = {}
-    if coords_match:
-        for line in coords_match.group(1).strip().split('\n'):
-            line = line.strip()
-            if line and not line.startswith('%'):
-                values = [float(x) for x in line.split()]
-                bus_coords[int(values[0])] = {'x': values[1], 'y': values[2]}
+    coords_data = _parse_matrix_block(_COORDS_RE.search(content, pos, endpos))
+    bus_coords = {int(row[0]): {'x': row[1], 'y': row[2]} for row in coords_data.tolist()}
     
     return {
         'baseMVA': baseMVA,
-        'bus': np.array(bus_data),
-        'gen': np.array(gen_data),
-        'branch': np.array(branch_data),
+        'bus': bus_data,
+        'gen': gen_data,
+        'branch': branch_data,
         'bus_coords': bus_coords
     }
 
+# MATPOWER节点类型编号 -> 前端节点类型（1=PQ, 2=PV, 3=平衡节点, 4=孤立节点），PV节点通常连接发电机
+_BUS_TYPE_NAMES = np.array(['load', 'load', 'generator', 'slack', 'load'])
+
 # 将MATPOWER格式转换为JSON格式
 def matpower_to_json(matpower_data):
     """将MATPOWER格式数据转换为可视化所需的JSON格式"""
     nodes = []
     links = []
     
-    # 处理节点数据
-    for i, bus in enumerate(matpower_data['bus']):
-        bus_i = int(bus[0])  # 节点编号
-        bus_type = int(bus[1])  # 节点类型 (3=slack, 2=PV, 1=PQ)
-        
-        # 确定节点类型（用于前端显示）
-        if bus_type == 3:
-            node_type = 'slack'
-        elif bus_type == 2:
-            node_type = 'generator'  # PV节点通常连接发电机
-        else:
-            node_type = 'load'
-        
+    # 处理节点数据：按列整体计算，避免逐行的Python循环
+    bus = np.asarray(matpower_data['bus'], dtype=float)
+    if bus.size == 0:
+        bus = bus.reshape(0, 13)
+    n_bus, ncols = bus.shape
+    zeros = np.zeros(n_bus)
+    
+    bus_ids = bus[:, 0].astype(int)  # 节点编号
+    types = bus[:, 1].astype(int)  # 节点类型 (3=slack, 2=PV, 1=PQ)
+    pd_arr = bus[:, 2] if ncols > 2 else zeros  # Pd
+    qd_arr = bus[:, 3] if ncols > 3 else zeros  # Qd
+    vm = bus[:, 7] if ncols > 7 else np.ones(n_bus)  # Vm
+    va_deg = bus[:, 8] if ncols > 8 else zeros  # Va（MATPOWER中已是角度制，无需转换）
+    
+    # 确定节点类型（用于前端显示），查表代替逐类型比较
+    node_types = _BUS_TYPE_NAMES[np.clip(types, 0, len(_BUS_TYPE_NAMES) - 1)]
+    
+    # 一次性建立 节点编号 -> 节点序号 的映射，发电机按所在节点O(1)定位
+    gen = np.asarray(matpower_data['gen'], dtype=float)
+    if gen.size == 0:
+        gen = gen.reshape(0, 10)
+    bus_pos = {bus_i: i for i, bus_i in enumerate(bus_ids.tolist())}
+    gen_pos = np.array([bus_pos.get(gen_bus, -1) for gen_bus in gen[:, 0].astype(int).tolist()], dtype=int)
+    on_bus = gen_pos >= 0
+    
+    has_gen = np.zeros(n_bus, dtype=bool)
+    has_gen[gen_pos[on_bus]] = True
+    # 同一节点连接多台发电机时出力求和
+    gen_p = np.bincount(gen_pos[on_bus], weights=gen[on_bus, 1], minlength=n_bus)  # Pg (发电机有功功率，正值)
+    gen_q = np.bincount(gen_pos[on_bus], weights=gen[on_bus, 2], minlength=n_bus)  # Qg (发电机无功功率，正值)
+    
+    # 有发电机的节点减去本节点负荷，纯负荷节点功率为负
+    active = np.where(has_gen, gen_p - np.where(pd_arr > 0, pd_arr, 0), -pd_arr)
+    reactive = np.where(has_gen, gen_q - np.where(qd_arr > 0, qd_arr, 0), -qd_arr)
+    
+    bus_coords = matpower_data['bus_coords']
+    for i, (bus_i, node_type, voltage, angle, active_power, reactive_power) in enumerate(zip(
+            bus_ids.tolist(), node_types.tolist(), vm.tolist(), va_deg.tolist(),
+            active.tolist(), reactive.tolist())):
         # 获取节点坐标
-        coords = matpower_data['bus_coords'].get(bus_i, {'x': 100 + i * 100, 'y': 150})
-        
-        # 处理功率数据
-        active_power = 0
-        reactive_power = 0
-        
-        # 检查该节点是否有发电机连接
-        gen_data = None
-        for gen in matpower_data['gen']:
-            if int(gen[0]) == bus_i:
-                gen_data = gen
-                break
-        
-        if gen_data is not None:
-            # 有发电机连接的节点
-            active_power = float(gen_data[1])  # Pg (发电机有功功率，正值)
-            reactive_power = float(gen_data[2])  # Qg (发电机无功功率，正值)
-            
-            # 如果该节点也有负荷，需要减去负荷功率
-            if len(bus) > 2 and bus[2] > 0:
-                active_power -= float(bus[2])  # 减去有功负荷
-            if len(bus) > 3 and bus[3] > 0:
-                reactive_power -= float(bus[3])  # 减去无功负荷
-        else:
-            # 纯负荷节点
-            active_power = -float(bus[2]) if len(bus) > 2 else 0  # Pd (负荷为负)
-            reactive_power = -float(bus[3]) if len(bus) > 3 else 0  # Qd (负荷为负)
-        
-        node = {
+        coords = bus_coords.get(bus_i, {'x': 100 + i * 100, 'y': 150})
+        nodes.append({
             'id': f'bus{bus_i}',
             'type': node_type,
             'x': coords['x'],
             'y': coords['y'],
-            'voltage': float(bus[7]) if len(bus) > 7 else 1.0,  # Vm
-            'angle': float(np.degrees(bus[8])) if len(bus) > 8 else 0.0,  # Va (转换为度)
+            'voltage': voltage,
+            'angle': angle,
             'active_power': active_power,
             'reactive_power': reactive_power
-        }
-        nodes.append(node)
+        })
     
-    # 处理线路数据（保持不变）
-    for branch in matpower_data['branch']:
+    # 处理线路数据（tolist一次性转换为Python数值，无需逐个float转换）
+    for branch in np.asarray(matpower_data['branch']).tolist():
         fbus = int(branch[0])  # 起始节点
         tbus = int(branch[1])  # 终止节点
-        r = float(branch[2])  # 电阻
-        x = float(branch[3])  # 电抗
+        r = branch[2]  # 电阻
+        x = branch[3]  # 电抗
         
         link = {
             'source': f'bus{fbus}',
             'target': f'bus{tbus}',
             'resistance': r,
             'reactance': x,
+            'capacity': branch[5] if len(branch) > 5 else 0,  # 额定容量rateA (MVA)，0表示不限
             'active_power': 0,  # 初始值，计算后更新
             'reactive_power': 0  # 初始值，计算后更新
         }
@@ -181,73 +201,68 @@ def matpower_to_json(matpower_data):
     
     return {'nodes': nodes, 'links': links}
 
+# 前端节点类型编码：1=负荷, 2=发电机, 3=平衡节点, 其他类型为0（按PQ节点处理）
+_NODE_TYPE_CODES = {'load': 1, 'generator': 2, 'slack': 3}
+
 # 潮流计算函数（使用PyPower牛顿法）
 def run_power_flow(nodes, links, method='newton-raphson'):
     """使用PyPower进行牛顿法潮流计算"""
+    # 先确定求解器，所有返回路径（包括异常）都报告实际使用的方法
+    use_fast_pf = NUMBA_AVAILABLE and len(nodes) >= FAST_PF_MIN_BUSES
+    pf_method = 'sparse-newton' if use_fast_pf else 'pypower-newton'
     try:
         if not PYPOWER_AVAILABLE:
             raise ImportError("pypower库未安装，请使用 pip install pypower 安装")
         
-        # 创建深拷贝以避免修改原始数据
-        nodes_copy = copy.deepcopy(nodes)
-        links_copy = copy.deepcopy(links)
-        
         # 将JSON数据转换为MATPOWER格式
-        node_id_to_idx = {node['id']: i for i, node in enumerate(nodes_copy)}
+        node_id_to_idx = {node['id']: i for i, node in enumerate(nodes)}
+        
+        # 节点数据按列存入结构化数组，bus/gen矩阵一次性整体计算
+        n_bus = len(nodes)
+        node_arr = np.empty(n_bus, dtype=[('voltage', 'f8'), ('angle', 'f8'), ('P', 'f8'), ('Q', 'f8'), ('type', 'i1')])
+        node_arr['voltage'] = [node['voltage'] for node in nodes]
+        node_arr['angle'] = [node['angle'] for node in nodes]
+        node_arr['P'] = [node['active_power'] for node in nodes]
+        node_arr['Q'] = [node['reactive_power'] for node in nodes]
+        node_arr['type'] = [_NODE_TYPE_CODES.get(node['type'], 0) for node in nodes]
+        
+        is_load = node_arr['type'] == 1
         
         # 构建bus矩阵
-        bus_data = []
-        for i, node in enumerate(nodes_copy):
-            bus_i = i + 1  # MATPOWER节点编号从1开始
-            
-            # 确定节点类型（符合PyPower标准）
-            if node['type'] == 'slack':
-                bus_type = 3  # 平衡节点
-            elif node['type'] == 'generator':
-                bus_type = 2  # PV节点
-            else:
-                bus_type = 1  # PQ节点
-            
-            # 处理负荷数据（确保为正值）
-            Pd = max(0, -node['active_power']) if node['type'] == 'load' else 0
-            Qd = max(0, -node['reactive_power']) if node['type'] == 'load' else 0
-            
-            # bus矩阵格式：[bus_i, type, Pd, Qd, Gs, Bs, area, Vm, Va, baseKV, zone, Vmax, Vmin]
-            bus_row = [
-                bus_i, bus_type, Pd, Qd, 0, 0, 1, 
-                node['voltage'], np.radians(node['angle']), 345, 1, 1.1, 0.9
-            ]
-            bus_data.append(bus_row)
+        # bus矩阵格式：[bus_i, type, Pd, Qd, Gs, Bs, area, Vm, Va, baseKV, zone, Vmax, Vmin]
+        bus_data = np.zeros((n_bus, 13))
+        bus_data[:, 0] = np.arange(1, n_bus + 1)  # MATPOWER节点编号从1开始
+        bus_data[:, 1] = np.maximum(node_arr['type'], 1)  # 节点类型（3=平衡节点, 2=PV节点, 1=PQ节点）
+        # 处理负荷数据（确保为正值）
+        bus_data[:, 2] = np.where(is_load, np.maximum(0, -node_arr['P']), 0)  # Pd
+        bus_data[:, 3] = np.where(is_load, np.maximum(0, -node_arr['Q']), 0)  # Qd
+        bus_data[:, 6] = 1  # area
+        bus_data[:, 7] = node_arr['voltage']  # Vm
+        bus_data[:, 8] = node_arr['angle']  # Va（前端与MATPOWER均为角度制，直接使用）
+        bus_data[:, 9] = 345  # baseKV
+        bus_data[:, 10] = 1  # zone
+        bus_data[:, 11] = 1.1  # Vmax
+        bus_data[:, 12] = 0.9  # Vmin
         
-        # 构建gen矩阵 - 使用原始输入数据
-        gen_data = []
-        for i, node in enumerate(nodes_copy):
-            if node['type'] in ['slack', 'generator']:
-                bus_i = i + 1
-                
-                # 获取发电机功率（确保为正值）
-                Pg = max(0, node['active_power'])
-                Qg = max(0, node['reactive_power'])
-                
-                # 设置发电机参数（符合PyPower标准）
-                # gen矩阵格式：[bus_i, Pg, Qg, Qmax, Qmin, Vg, mBase, status, Pmax, Pmin]
-                gen_row = [
-                    bus_i,                    # 节点编号
-                    Pg,                       # 有功功率输出 (MW)
-                    Qg,                       # 无功功率输出 (MVAr)
-                    300,                      # Qmax (MVAr) - 最大无功输出
-                    -300,                     # Qmin (MVAr) - 最小无功输出
-                    node['voltage'],          # Vg (pu) - 电压设定值
-                    100,                      # mBase (MVA) - 基准功率
-                    1,                        # status - 发电机状态 (1=在线)
-                    250,                      # Pmax (MW) - 最大有功输出
-                    10                        # Pmin (MW) - 最小有功输出
-                ]
-                gen_data.append(gen_row)
+        # 构建gen矩阵 - 使用原始输入数据（平衡节点和发电节点）
+        # gen矩阵格式：[bus_i, Pg, Qg, Qmax, Qmin, Vg, mBase, status, Pmax, Pmin]
+        gen_idx = np.flatnonzero(node_arr['type'] >= 2)
+        gen_nodes = node_arr[gen_idx]
+        gen_data = np.zeros((len(gen_idx), 10))
+        gen_data[:, 0] = gen_idx + 1                          # 节点编号
+        gen_data[:, 1] = np.maximum(0, gen_nodes['P'])        # 有功功率输出 (MW)，确保为正值
+        gen_data[:, 2] = np.maximum(0, gen_nodes['Q'])        # 无功功率输出 (MVAr)，确保为正值
+        gen_data[:, 3] = 300                                  # Qmax (MVAr) - 最大无功输出
+        gen_data[:, 4] = -300                                 # Qmin (MVAr) - 最小无功输出
+        gen_data[:, 5] = gen_nodes['voltage']                 # Vg (pu) - 电压设定值
+        gen_data[:, 6] = 100                                  # mBase (MVA) - 基准功率
+        gen_data[:, 7] = 1                                    # status - 发电机状态 (1=在线)
+        gen_data[:, 8] = 250                                  # Pmax (MW) - 最大有功输出
+        gen_data[:, 9] = 10                                   # Pmin (MW) - 最小有功输出
         
         # 构建branch矩阵
         branch_data = []
-        for link in links_copy:
+        for link in links:
             source_id = link['source']['id'] if isinstance(link['source'], dict) else link['source']
             target_id = link['target']['id'] if isinstance(link['target'], dict) else link['target']
             
@@ -257,7 +272,7 @@ def run_power_flow(nodes, links, method='newton-raphson'):
             # branch矩阵格式：[fbus, tbus, r, x, b, rateA, rateB, rateC, ratio, angle, status, angmin, angmax]
             branch_row = [
                 fbus, tbus, link['resistance'], link['reactance'], 0, 
-                0, 0, 0, 0, 0, 1, -360, 360
+                link.get('capacity', 0), 0, 0, 0, 0, 1, -360, 360
             ]
             branch_data.append(branch_row)
         
@@ -265,14 +280,18 @@ def run_power_flow(nodes, links, method='newton-raphson'):
         ppc = {
             'version': '2',
             'baseMVA': 100.0,
-            'bus': np.array(bus_data),
-            'gen': np.array(gen_data) if gen_data else np.array([]).reshape(0, 10),
+            'bus': bus_data,
+            'gen': gen_data,
             'branch': np.array(branch_data)
         }
         
-        # 使用PyPower进行潮流计算
-        logger.info("开始PyPower牛顿法潮流计算")
-        results = pp.runpf(ppc)
+        # 使用PyPower进行潮流计算，较大系统使用稀疏牛顿法
+        if use_fast_pf:
+            logger.info("开始稀疏牛顿法潮流计算")
+            results = runpf_fast(ppc)
+        else:
+            logger.info("开始PyPower牛顿法潮流计算")
+            results = pp.runpf(ppc)
         
         # 处理计算结果
         if isinstance(results, tuple):
@@ -282,43 +301,42 @@ def run_power_flow(nodes, links, method='newton-raphson'):
             if not success:
                 logger.error(f"潮流计算未收敛")
                 return {
-                    'nodes': nodes_copy,
-                    'links': links_copy,
+                    'nodes': nodes,
+                    'links': links,
                     'converged': False,
                     'error': '潮流计算未收敛，请检查系统数据或调整计算参数',
-                    'method': 'pypower-newton'
+                    'method': pf_method
                 }
             
             bus_results = ppc_result['bus']
             branch_results = ppc_result['branch']
             
+            # 线路两端功率按列一次性取出，统计计算和线路结果共用
+            has_flow = branch_results.ndim == 2 and branch_results.shape[1] > 16
+            if has_flow:
+                pf = branch_results[:, 13]  # 起始端有功功率
+                qf = branch_results[:, 14]  # 起始端无功功率
+                pt = branch_results[:, 15]  # 末端有功功率
+                qt = branch_results[:, 16]  # 末端无功功率
+                loss_p = pf + pt  # 线路有功损耗
+                loss_q = qf + qt  # 线路无功损耗
+            
             # 添加统计计算
             try:
-                vm = bus_results[:, 7] if bus_results.shape[1] > 7 else [node['voltage'] for node in nodes_copy]
+                vm = bus_results[:, 7] if bus_results.shape[1] > 7 else [node['voltage'] for node in nodes]
                 
                 # 线路负载计算
-                if branch_results.shape[1] > 16:
-                    # 获取线路两端的有功和无功功率
-                    pf_from = branch_results[:, 13]  # 起始端有功功率
-                    qf_from = branch_results[:, 14]  # 起始端无功功率
-                    pf_to = branch_results[:, 15]    # 末端有功功率
-                    qf_to = branch_results[:, 16]    # 末端无功功率
-                    
-                    # 计算两端视在功率（转换为实际值）
-                    apparent_power_from = np.sqrt(pf_from**2 + qf_from**2) * ppc_result['baseMVA']
-                    apparent_power_to = np.sqrt(pf_to**2 + qf_to**2) * ppc_result['baseMVA']
+                if has_flow:
+                    # 两端视在功率取最大值作为线路负载（潮流结果已是MW/MVAr实际值）
+                    apparent_power = np.maximum(np.hypot(pf, qf), np.hypot(pt, qt))
                     
-                    # 取两端的最大值作为线路负载
-                    apparent_power = np.maximum(apparent_power_from, apparent_power_to)
-                    
-                    # 获取线路额定容量（假设branch_results[:, 5]是MVA容量）
+                    # 线路额定容量rateA (MVA)，额定容量为0的线路负载记为0
                     rated_capacity = branch_results[:, 5]
-                    
-                    with np.errstate(divide='ignore', invalid='ignore'):
-                        branch_load = (apparent_power / rated_capacity) * 100
-                    branch_load[rated_capacity == 0] = 0
+                    branch_load = np.divide(apparent_power, rated_capacity,
+                                            out=np.zeros_like(apparent_power),
+                                            where=rated_capacity != 0) * 100
                 else:
-                    branch_load = [0] * len(links_copy)
+                    branch_load = np.zeros(len(links))
                 
                 stats = {
                     'voltage': {
@@ -327,17 +345,23 @@ def run_power_flow(nodes, links, method='newton-raphson'):
                         'avg': round(float(np.mean(vm)), 4)
                     },
                     'losses': {
-                        'P': round(float(np.sum(branch_results[:, 14])), 2) if branch_results.shape[1] > 14 else 0,
-                        'Q': round(float(np.sum(branch_results[:, 15])), 2) if branch_results.shape[1] > 15 else 0
+                        'P': round(float(np.sum(loss_p)), 2) if has_flow else 0,
+                        'Q': round(float(np.sum(loss_q)), 2) if has_flow else 0
                     },
                     'generation': {
                         'total': round(float(np.sum(ppc_result['gen'][:, 1])), 2)
                     },
+                    'branch': {
+                        'max_load': round(float(np.max(branch_load)), 2) if len(branch_load) else 0,
+                        'max_id': int(np.argmax(branch_load)) + 1 if np.any(branch_load) else 0,  # 线路序号，无负载时为0
+                        'avg_load': round(float(np.mean(branch_load)), 2) if len(branch_load) else 0,
+                        'overload_count': int(np.count_nonzero(branch_load > 100))
+                    },
                     'topology': {
-                        'total_branches': len(links_copy),
-                        'total_buses': len(nodes_copy),
-                        'network_density': round(float(len(links_copy) / (len(nodes_copy) * (len(nodes_copy) - 1) / 2)), 3) if len(nodes_copy) > 1 else 0,
-                        'average_connectivity': round(float(len(links_copy) * 2 / len(nodes_copy)), 2) if len(nodes_copy) > 0 else 0
+                        'total_branches': len(links),
+                        'total_buses': len(nodes),
+                        'network_density': round(float(len(links) / (len(nodes) * (len(nodes) - 1) / 2)), 3) if len(nodes) > 1 else 0,
+                        'average_connectivity': round(float(len(links) * 2 / len(nodes)), 2) if len(nodes) > 0 else 0
                     }
                 }
 
@@ -348,220 +372,244 @@ def run_power_flow(nodes, links, method='newton-raphson'):
             
             logger.info("潮流计算收敛")
             
+            # 仅在收敛时创建浅拷贝写入结果，避免修改原始数据（节点和线路都是标量字段的字典，无需深拷贝）
+            nodes_copy = [node.copy() for node in nodes]
+            links_copy = [link.copy() for link in links]
+            
             # 更新节点计算结果
+            vm_arr = bus_results[:, 7].tolist()
+            va_arr = bus_results[:, 8].tolist()
+            # 发电机结果按所在节点编号（即节点序号+1）建立索引
+            gen_lookup = {int(g[0]): (g[1], g[2]) for g in ppc_result['gen'].tolist()}
+            has_gen = (node_arr['type'] >= 2).tolist()
             for i, node in enumerate(nodes_copy):
-                if hasattr(bus_results, 'dtype') and bus_results.dtype.names:
-                    node['voltage'] = float(bus_results[i]['VM'])
-                    node['angle'] = float(bus_results[i]['VA'])
-                else:
-                    bus_result = bus_results[i]
-                    node['voltage'] = float(bus_result[7])
-                    node['angle'] = float(bus_result[8])
+                node['voltage'] = vm_arr[i]
+                node['angle'] = va_arr[i]
                 
-                # 对于平衡节点和发电节点，更新功率为计算结果
-                # 对于负荷节点，保持原始输入数据
-                if node['type'] in ['slack', 'generator']:
-                    bus_i = int(node['id'].replace('bus', '')) if isinstance(node['id'], str) else int(node['id'])
-                    
-                    # 从PyPower计算结果中获取发电机功率
-                    gen_idx = next((j for j, g in enumerate(ppc_result['gen']) if g[0] == bus_i), None)
-                    if gen_idx is not None:
-                        node['active_power'] = float(ppc_result['gen'][gen_idx][1])  # Pg
-                        node['reactive_power'] = float(ppc_result['gen'][gen_idx][2])  # Qg
+                # 对于平衡节点和发电节点，更新功率为计算结果（Pg, Qg）
                 # 对于负荷节点，不修改active_power和reactive_power，保持原始输入数据
+                if has_gen[i]:
+                    gen_result = gen_lookup.get(i + 1)
+                    if gen_result is not None:
+                        node['active_power'], node['reactive_power'] = gen_result
 
-            # 更新线路功率
-            for i, link in enumerate(links_copy):
+            # 更新线路功率：先建立 (fbus, tbus) -> 行号 索引，每条线路O(1)查找
+            fbus_arr = branch_results[:, 0].astype(int)
+            tbus_arr = branch_results[:, 1].astype(int)
+            branch_idx = {(f, t): j for j, (f, t) in enumerate(zip(fbus_arr.tolist(), tbus_arr.tolist()))}
+            # 计算结果一次性转换为Python数值，循环内只做局部变量读取
+            branch_results_list = branch_results.tolist() if has_flow else []
+            
+            for link in links_copy:
                 source_id = link['source']['id'] if isinstance(link['source'], dict) else link['source']
                 target_id = link['target']['id'] if isinstance(link['target'], dict) else link['target']
                 
-                def get_matpower_bus_id(node_id):
-                    if isinstance(node_id, str):
-                        return int(node_id[3:]) if node_id.startswith('bus') else int(node_id)
-                    return int(node_id)
+                # 与构建branch矩阵时相同，按节点在列表中的位置编号（不依赖节点ID中的数字）
+                source_idx = node_id_to_idx[source_id] + 1
+                target_idx = node_id_to_idx[target_id] + 1
                 
-                source_idx = get_matpower_bus_id(source_id)
-                target_idx = get_matpower_bus_id(target_id)
+                j = branch_idx.get((source_idx, target_idx))
+                reversed_branch = False
+                if j is None:
+                    j = branch_idx.get((target_idx, source_idx))
+                    reversed_branch = True
                 
-                branch_found = False
-                for j, branch in enumerate(branch_results):
-                    fbus = int(branch[0])
-                    tbus = int(branch[1])
-                    
-                    if (fbus == source_idx and tbus == target_idx) or (fbus == target_idx and tbus == source_idx):
-                        branch_found = True
-                        
-                        if len(branch) >= 17:
-                            # 在现有的线路功率更新代码中添加
-                            if fbus == source_idx:
-                                link['active_power'] = float(branch[13])
-                                link['reactive_power'] = float(branch[14])
-                                # 添加前端期望的变量
-                                link['from_active'] =  float(branch[13])
-                                link['from_reactive'] =  float(branch[14])
-                                link['to_active'] = - float(branch[15])
-                                link['to_reactive'] = - float(branch[16])
-                                link['loss_active'] = float(branch[13]) + float(branch[15])
-                                link['loss_reactive'] = float(branch[14]) + float(branch[16])
-                            else:
-                                link['active_power'] = float(branch[13])
-                                link['reactive_power'] = float(branch[14])
-                                # 添加前端期望的变量（反向）
-                                link['from_active'] = - float(branch[15])
-                                link['from_reactive'] = - float(branch[16])
-                                link['to_active'] = - float(branch[13])
-                                link['to_reactive'] = - float(branch[14])
-                                link['loss_active'] = float(branch[15]) + float(branch[13])
-                                link['loss_reactive'] = float(branch[16]) + float(branch[14])
-                        else:
-                            if not branch_found:
-                                link['active_power'] = 0
-                                link['reactive_power'] = 0
-                            break
-                
-                if not branch_found:
+                if j is None or not has_flow:
                     link['active_power'] = 0
                     link['reactive_power'] = 0
+                    continue
+                
+                p_from, q_from, p_to, q_to = branch_results_list[j][13:17]
+                link['active_power'] = p_from
+                link['reactive_power'] = q_from
+                if not reversed_branch:
+                    # 添加前端期望的变量
+                    link['from_active'] = p_from
+                    link['from_reactive'] = q_from
+                    link['to_active'] = -p_to
+                    link['to_reactive'] = -q_to
+                else:
+                    # 添加前端期望的变量（反向）
+                    link['from_active'] = -p_to
+                    link['from_reactive'] = -q_to
+                    link['to_active'] = -p_from
+                    link['to_reactive'] = -q_from
+                link['loss_active'] = p_from + p_to
+                link['loss_reactive'] = q_from + q_to
             
             logger.info("线路功率数据处理完成")
             return {
                 'nodes': nodes_copy,
                 'links': links_copy,
                 'converged': True,
-                'method': 'pypower-newton',
+                'method': pf_method,
                 'stats': stats
             }
         else:
             logger.warning(f"潮流计算未收敛")
             return {
-                'nodes': nodes_copy,
-                'links': links_copy,
+                'nodes': nodes,
+                'links': links,
                 'converged': False,
                 'error': '潮流计算未收敛',
-                'method': 'pypower-newton'
+                'method': pf_method
             }
             
     except Exception as e:
         logger.error(f"潮流计算失败: {str(e)}")
         return {
-            'nodes': nodes_copy,
-            'links': links_copy,
+            'nodes': nodes,
+            'links': links,
             'converged': False,
             'error': str(e),
-            'method': 'pypower-newton'
+            'method': pf_method
         }
 
+@functools.lru_cache(maxsize=16)
+def _auto_coords(n):
+    """为编号1..n的节点生成网格布局坐标（每行10个节点）"""
+    idx = np.arange(n)
+    xs = (100 + (idx % 10) * 100).tolist()
+    ys = (100 + (idx // 10) * 100).tolist()
+    return {i + 1: {'x': x, 'y': y} for i, (x, y) in enumerate(zip(xs, ys))}
+
+# 默认4节点电网数据（无法加载案例时使用），模块加载时序列化一次
+_DEFAULT_GRID = {
+    'nodes': [
+        {'id': 'bus1', 'type': 'slack', 'x': 100, 'y': 150, 'voltage': 1.0, 'angle': 0.0, 'active_power': 0, 'reactive_power': 0},
+        {'id': 'bus2', 'type': 'load', 'x': 200, 'y': 100, 'voltage': 1.0, 'angle': 0.0, 'active_power': -80, 'reactive_power': -30},
+        {'id': 'bus3', 'type': 'load', 'x': 300, 'y': 150, 'voltage': 1.0, 'angle': 0.0, 'active_power': -60, 'reactive_power': -20},
+        {'id': 'bus4', 'type': 'generator', 'x': 200, 'y': 200, 'voltage': 1.0, 'angle': 0.0, 'active_power': 150, 'reactive_power': 75}
+    ],
+    'links': [
+        {'source': 'bus1', 'target': 'bus2', 'resistance': 0.02, 'reactance': 0.06, 'active_power': 0, 'reactive_power': 0},
+        {'source': 'bus1', 'target': 'bus3', 'resistance': 0.03, 'reactance': 0.08, 'active_power': 0, 'reactive_power': 0},
+        {'source': 'bus2', 'target': 'bus4', 'resistance': 0.01, 'reactance': 0.03, 'active_power': 0, 'reactive_power': 0},
+        {'source': 'bus3', 'target': 'bus4', 'resistance': 0.02, 'reactance': 0.05, 'active_power': 0, 'reactive_power': 0}
+    ]
+}
+_DEFAULT_GRID_JSON = orjson.dumps(_DEFAULT_GRID)
+
+# 主页模板使用的默认统计数据
+_DEFAULT_STATS = {
+    'voltage': {'max': 0, 'min': 0, 'avg': 0},
+    'losses': {'P': 0, 'Q': 0},
+    'generation': {'total': 0},
+    'branch': {'max_load': 0, 'max_id': 0, 'avg_load': 0, 'overload_count': 0},
+    'topology': {
+        'total_branches': 0,
+        'total_nodes': 0,
+        'network_density': 0,
+        'avg_connectivity': 0
+    }
+}
+
+# PyPower内置案例名称
+_BUILTIN_CASES = ('case9', 'case14', 'case30', 'case39', 'case57', 'case118')
+
 # 在run_power_flow函数之后，路由定义之前添加load_case_data函数
+@functools.lru_cache(maxsize=16)
+def _load_case_cached(case_name):
+    """加载PyPower内置案例并序列化为JSON（内置案例是静态数据，按名称缓存）"""
+    # 使用直接导入的方式获取案例数据
+    case_functions = {
+        'case9': case9.case9,
+        'case14': case14.case14,
+        'case30': case30.case30,
+        'case39': case39.case39,
+        'case57': case57.case57,
+        'case118': case118.case118,
+    }
+    
+    case_data = case_functions[case_name]()
+    # 添加节点坐标（内置案例不含坐标，自动生成网格布局）
+    case_data['bus_coords'] = _auto_coords(len(case_data['bus']))
+    
+    logger.info(f"成功加载PyPower内置{case_name}数据")
+    return orjson.dumps(matpower_to_json(case_data))
+
 def load_case_data(case_name):
-    """加载指定名称的PyPower案例数据"""
+    """加载指定名称的PyPower案例数据，返回序列化后的JSON"""
     try:
         if not PYPOWER_AVAILABLE:
             raise ImportError("pypower库未安装，请使用 pip install pypower 安装")
         
-        # PyPower内置案例坐标映射
-        case_coords = {
-            'case9': {
-                1: {'x': 100, 'y': 150}, 2: {'x': 200, 'y': 100}, 3: {'x': 300, 'y': 150},
-                4: {'x': 400, 'y': 200}, 5: {'x': 500, 'y': 250}, 6: {'x': 600, 'y': 200},
-                7: {'x': 700, 'y': 150}, 8: {'x': 800, 'y': 100}, 9: {'x': 900, 'y': 150}
-            },
-            'case14': {
-                1: {'x': 100, 'y': 150}, 2: {'x': 150, 'y': 120}, 3: {'x': 200, 'y': 100},
-                4: {'x': 250, 'y': 80}, 5: {'x': 300, 'y': 60}, 6: {'x': 350, 'y': 80},
-                7: {'x': 400, 'y': 100}, 8: {'x': 450, 'y': 120}, 9: {'x': 500, 'y': 150},
-                10: {'x': 100, 'y': 200}, 11: {'x': 150, 'y': 220}, 12: {'x': 200, 'y': 240},
-                13: {'x': 250, 'y': 260}, 14: {'x': 300, 'y': 280}
-            },
-            'case30': {
-                1: {'x': 100, 'y': 150}, 2: {'x': 150, 'y': 120}, 3: {'x': 200, 'y': 100},
-                4: {'x': 250, 'y': 80}, 5: {'x': 300, 'y': 60}, 6: {'x': 350, 'y': 80},
-                7: {'x': 400, 'y': 100}, 8: {'x': 450, 'y': 120}, 9: {'x': 500, 'y': 150},
-                10: {'x': 100, 'y': 200}, 11: {'x': 150, 'y': 220}, 12: {'x': 200, 'y': 240},
-                13: {'x': 250, 'y': 260}, 14: {'x': 300, 'y': 280}, 15: {'x': 350, 'y': 260},
-                16: {'x': 400, 'y': 240}, 17: {'x': 450, 'y': 220}, 18: {'x': 500, 'y': 200},
-                19: {'x': 550, 'y': 150}, 20: {'x': 600, 'y': 120}, 21: {'x': 650, 'y': 100},
-                22: {'x': 700, 'y': 80}, 23: {'x': 750, 'y': 60}, 24: {'x': 800, 'y': 80},
-                25: {'x': 850, 'y': 100}, 26: {'x': 900, 'y': 120}, 27: {'x': 950, 'y': 150},
-                28: {'x': 1000, 'y': 200}, 29: {'x': 1050, 'y': 250}, 30: {'x': 1100, 'y': 300}
-            }
-        }
+        if case_name in _BUILTIN_CASES:
+            return _load_case_cached(case_name)
         
-        # 使用直接导入的方式获取案例数据
-        case_functions = {
-            'case9': case9.case9,
-            'case14': case14.case14,
-            'case30': case30.case30,
-            'case39': case39.case39,
-            'case57': case57.case57,
-            'case118': case118.case118,
-        }
+        # 尝试加载本地文件（解析结果按文件修改时间缓存）
+        local_path = os.path.join(DATA_DIR, f'{case_name}.m')
+        if os.path.exists(local_path):
+            try:
+                matpower_data = parse_matpower_file(local_path)
+                logger.info(f"使用本地{case_name}.m文件")
+                return orjson.dumps(matpower_to_json(matpower_data))
+            except Exception as e:
+                logger.warning(f"无法解析{case_name}.m文件: {e}")
         
-        if case_name in case_functions:
-            case_data = case_functions[case_name]()
-            # 添加节点坐标
-            if case_name in case_coords:
-                case_data['bus_coords'] = case_coords[case_name]
-            else:
-                # 如果没有预定义坐标，自动生成
-                bus_coords = {}
-                for i, bus in enumerate(case_data['bus']):
-                    bus_id = int(bus[0])
-                    bus_coords[bus_id] = {
-                        'x': 100 + (i % 10) * 100,
-                        'y': 100 + (i // 10) * 100
-                    }
-                case_data['bus_coords'] = bus_coords
-            
-            logger.info(f"成功加载PyPower内置{case_name}数据")
-            return matpower_to_json(case_data)
-        else:
-            # 尝试加载本地文件
-            local_path = os.path.join(DATA_DIR, f'{case_name}.m')
-            if os.path.exists(local_path):
-                try:
-                    matpower_data = parse_matpower_file(local_path)
-                    logger.info(f"使用本地{case_name}.m文件")
-                    return matpower_to_json(matpower_data)
-                except Exception as e:
-                    logger.warning(f"无法解析{case_name}.m文件: {e}")
-            
-            # 如果都失败，返回默认数据
-            logger.warning(f"无法加载{case_name}，使用默认4节点数据")
-            return {
-                'nodes': [
-                    {'id': 'bus1', 'type': 'slack', 'x': 100, 'y': 150, 'voltage': 1.0, 'angle': 0.0, 'active_power': 0, 'reactive_power': 0},
-                    {'id': 'bus2', 'type': 'load', 'x': 200, 'y': 100, 'voltage': 1.0, 'angle': 0.0, 'active_power': -80, 'reactive_power': -30},
-                    {'id': 'bus3', 'type': 'load', 'x': 300, 'y': 150, 'voltage': 1.0, 'angle': 0.0, 'active_power': -60, 'reactive_power': -20},
-                    {'id': 'bus4', 'type': 'generator', 'x': 200, 'y': 200, 'voltage': 1.0, 'angle': 0.0, 'active_power': 150, 'reactive_power': 75}
-                ],
-                'links': [
-                    {'source': 'bus1', 'target': 'bus2', 'resistance': 0.02, 'reactance': 0.06, 'active_power': 0, 'reactive_power': 0},
-                    {'source': 'bus1', 'target': 'bus3', 'resistance': 0.03, 'reactance': 0.08, 'active_power': 0, 'reactive_power': 0},
-                    {'source': 'bus2', 'target': 'bus4', 'resistance': 0.01, 'reactance': 0.03, 'active_power': 0, 'reactive_power': 0},
-                    {'source': 'bus3', 'target': 'bus4', 'resistance': 0.02, 'reactance': 0.05, 'active_power': 0, 'reactive_power': 0}
-                ]
-            }
+        # 如果都失败，返回默认数据
+        logger.warning(f"无法加载{case_name}，使用默认4节点数据")
+        return _DEFAULT_GRID_JSON
     except Exception as e:
         logger.error(f"加载{case_name}数据失败: {str(e)}")
         raise Exception(f"加载{case_name}数据失败: {str(e)}")
 
+# 潮流计算进程池：PF_POOL_WORKERS个工作进程，多个计算请求并行求解
+_PF_POOL = None
+_PF_POOL_LOCK = threading.Lock()
+
+def get_pf_pool():
+    """获取潮流计算进程池，首次创建时提交case30计算预热各工作进程"""
+    global _PF_POOL
+    with _PF_POOL_LOCK:
+        if _PF_POOL is None:
+            workers = max(1, PF_POOL_WORKERS)
+            # 使用spawn启动工作进程，避免在多线程的Web进程中fork
+            _PF_POOL = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            if PYPOWER_AVAILABLE:
+                # case30节点数达到FAST_PF_MIN_BUSES，预热时同时加载稀疏牛顿法的numba编译结果
+                warmup = orjson.loads(load_case_data('case30'))
+                for _ in range(workers):
+                    _PF_POOL.submit(run_power_flow, warmup['nodes'], warmup['links'])
+        return _PF_POOL
+
+def reset_pf_pool(old_pool, cancel_pending=True):
+    """丢弃进程池（工作进程被杀死、计算超时等），下次调用get_pf_pool时重新创建
+
+    cancel_pending=False时旧进程池中已提交的计算继续完成，之后工作进程退出。
+    """
+    global _PF_POOL
+    with _PF_POOL_LOCK:
+        if _PF_POOL is old_pool:
+            _PF_POOL = None
+    old_pool.shutdown(wait=False, cancel_futures=cancel_pending)
+
+def solve_in_pool(nodes, links, method='newton-raphson'):
+    """在进程池中执行潮流计算，进程池损坏时重建并重试一次"""
+    for attempt in range(2):
+        pool = get_pf_pool()
+        try:
+            future = pool.submit(run_power_flow, nodes, links, method=method)
+            try:
+                return future.result(timeout=PF_TIMEOUT)
+            except FutureTimeoutError:
+                # 尚未开始执行的任务直接取消；已在运行的任务会一直占用工作进程，
+                # 换用新进程池，避免几次慢计算占满进程池后所有请求都超时
+                if not future.cancel():
+                    logger.warning("潮流计算超时且已在执行，重新创建进程池")
+                    reset_pf_pool(pool, cancel_pending=False)
+                raise
+        except BrokenProcessPool:
+            if attempt:
+                raise
+            logger.warning("潮流计算进程池已损坏，重新创建后重试")
+            reset_pf_pool(pool)
+
 # 路由：主页
 @app.route('/')
 def index():
     # 提供默认的统计数据，避免模板渲染错误
-    default_stats = {
-        'voltage': {'max': 0, 'min': 0, 'avg': 0},
-        'losses': {'P': 0, 'Q': 0},
-        'generation': {'total': 0},
-        'branch': {'max_load': 0, 'max_id': 0, 'avg_load': 0, 'overload_count': 0},
-        'topology': {
-            'total_branches': 0,
-            'total_nodes': 0,
-            'network_density': 0,
-            'avg_connectivity': 0
-        }
-    }
-    return render_template('index.html', stats=default_stats)
+    return render_template('index.html', stats=_DEFAULT_STATS)
 
 # 路由：获取电网数据
 @app.route('/api/grid-data', methods=['GET'])
@@ -571,23 +619,10 @@ def load_grid_data():
         if PYPOWER_AVAILABLE:
             # 尝试使用pypower内置的case30数据
             try:
-                case30 = pp.case30()
-                # 添加节点坐标（因为pypower内置数据不包含坐标）
-                bus_coords = {
-                    1: {'x': 100, 'y': 150}, 2: {'x': 150, 'y': 120}, 3: {'x': 200, 'y': 100},
-                    4: {'x': 250, 'y': 80}, 5: {'x': 300, 'y': 60}, 6: {'x': 350, 'y': 80},
-                    7: {'x': 400, 'y': 100}, 8: {'x': 450, 'y': 120}, 9: {'x': 500, 'y': 150},
-                    10: {'x': 100, 'y': 200}, 11: {'x': 150, 'y': 220}, 12: {'x': 200, 'y': 240},
-                    13: {'x': 250, 'y': 260}, 14: {'x': 300, 'y': 280}, 15: {'x': 350, 'y': 260},
-                    16: {'x': 400, 'y': 240}, 17: {'x': 450, 'y': 220}, 18: {'x': 500, 'y': 200},
-                    19: {'x': 550, 'y': 150}, 20: {'x': 600, 'y': 120}, 21: {'x': 650, 'y': 100},
-                    22: {'x': 700, 'y': 80}, 23: {'x': 750, 'y': 60}, 24: {'x': 800, 'y': 80},
-                    25: {'x': 850, 'y': 100}, 26: {'x': 900, 'y': 120}, 27: {'x': 950, 'y': 150},
-                    28: {'x': 1000, 'y': 200}, 29: {'x': 1050, 'y': 250}, 30: {'x': 1100, 'y': 300}
-                }
-                case30['bus_coords'] = bus_coords
+                # 与加载内置案例共用同一份已序列化的缓存结果
+                payload = _load_case_cached('case30')
                 logger.info("使用pypower内置case30数据")
-                return matpower_to_json(case30)
+                return Response(payload, mimetype='application/json')
             except Exception as e:
                 logger.warning(f"无法加载pypower内置case30数据: {e}")
         
@@ -596,7 +631,7 @@ def load_grid_data():
             try:
                 matpower_data = parse_matpower_file(case30_path)
                 logger.info("使用本地case30.m文件")
-                return matpower_to_json(matpower_data)
+                return fast_jsonify(matpower_to_json(matpower_data))
             except Exception as e:
                 logger.warning(f"无法解析case30.m文件: {e}")
         
@@ -606,7 +641,7 @@ def load_grid_data():
             try:
                 matpower_data = parse_matpower_file(case9_path)
                 logger.info("使用本地case9.m文件")
-                return matpower_to_json(matpower_data)
+                return fast_jsonify(matpower_to_json(matpower_data))
             except Exception as e:
                 logger.warning(f"无法解析case9.m文件: {e}")
         
@@ -617,30 +652,17 @@ def load_grid_data():
                 with open(json_path, 'r', encoding='utf-8') as f:
                     data = json.load(f)
                 logger.info("使用本地JSON数据")
-                return data
+                return fast_jsonify(data)
             except Exception as e:
                 logger.warning(f"无法读取JSON数据: {e}")
         
-        # 使用默认的4节点数据
+        # 使用默认的4节点数据（已预先序列化）
         logger.info("使用默认4节点数据")
-        return {
-            'nodes': [
-                {'id': 'bus1', 'type': 'slack', 'x': 100, 'y': 150, 'voltage': 1.0, 'angle': 0.0, 'active_power': 0, 'reactive_power': 0},
-                {'id': 'bus2', 'type': 'load', 'x': 200, 'y': 100, 'voltage': 1.0, 'angle': 0.0, 'active_power': -80, 'reactive_power': -30},
-                {'id': 'bus3', 'type': 'load', 'x': 300, 'y': 150, 'voltage': 1.0, 'angle': 0.0, 'active_power': -60, 'reactive_power': -20},
-                {'id': 'bus4', 'type': 'generator', 'x': 200, 'y': 200, 'voltage': 1.0, 'angle': 0.0, 'active_power': 150, 'reactive_power': 75}
-            ],
-            'links': [
-                {'source': 'bus1', 'target': 'bus2', 'resistance': 0.02, 'reactance': 0.06, 'active_power': 0, 'reactive_power': 0},
-                {'source': 'bus1', 'target': 'bus3', 'resistance': 0.03, 'reactance': 0.08, 'active_power': 0, 'reactive_power': 0},
-                {'source': 'bus2', 'target': 'bus4', 'resistance': 0.01, 'reactance': 0.03, 'active_power': 0, 'reactive_power': 0},
-                {'source': 'bus3', 'target': 'bus4', 'resistance': 0.02, 'reactance': 0.05, 'active_power': 0, 'reactive_power': 0}
-            ]
-        }
+        return Response(_DEFAULT_GRID_JSON, mimetype='application/json')
     
     except Exception as e:
         logger.error(f"加载电网数据失败: {str(e)}")
-        return jsonify({'error': str(e)}), 500
+        return fast_jsonify({'error': str(e)}), 500
 
 # 路由：执行潮流计算
 @app.route('/api/calculate-flow', methods=['POST'])
@@ -650,13 +672,16 @@ def calculate_power_flow():
         nodes = data.get('nodes', [])
         links = data.get('links', [])
         
-        # 使用PyPower牛顿法进行计算
-        result = run_power_flow(nodes, links, method='newton-raphson')
+        # 使用PyPower牛顿法进行计算（在进程池中执行，不阻塞其他请求）
+        result = solve_in_pool(nodes, links, method='newton-raphson')
         
-        return jsonify(result)
+        return fast_jsonify(result)
+    except FutureTimeoutError:
+        logger.error(f"潮流计算超时（超过{PF_TIMEOUT}秒）")
+        return fast_jsonify({'error': f'潮流计算超时（超过{PF_TIMEOUT}秒），请检查系统数据或稍后重试'}), 504
     except Exception as e:
         logger.error(f"潮流计算失败: {str(e)}")
-        return jsonify({'error': str(e)}), 500
+        return fast_jsonify({'error': str(e)}), 500
 
 # 路由：保存电网数据
 @app.route('/api/save-grid', methods=['POST'])
@@ -666,10 +691,10 @@ def save_grid_data():
         file_path = os.path.join(DATA_DIR, 'grid_data.json')
         with open(file_path, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2)
-        return jsonify({'success': True})
+        return fast_jsonify({'success': True})
     except Exception as e:
         logger.error(f"保存电网数据失败: {str(e)}")
-        return jsonify({'error': str(e)}), 500
+        return fast_jsonify({'error': str(e)}), 500
 
 # 路由：加载指定案例数据
 @app.route('/api/load-case', methods=['POST'])
@@ -679,14 +704,17 @@ def api_load_case():
         case_name = data.get('case')
         
         if not case_name:
-            return jsonify({'error': '缺少案例名称参数'}), 400
+            return fast_jsonify({'error': '缺少案例名称参数'}), 400
         
-        # 调用load_case_data函数加载指定案例
-        result = load_case_data(case_name)
-        return jsonify(result)
+        # 调用load_case_data函数加载指定案例（已序列化的JSON）
+        payload = load_case_data(case_name)
+        return Response(payload, mimetype='application/json')
     except Exception as e:
         logger.error(f"加载案例数据失败: {str(e)}")
-        return jsonify({'error': str(e)}), 500
+        return fast_jsonify({'error': str(e)}), 500
 
 if __name__ == '__main__':
+    # 启动时预热潮流计算进程池（调试模式下只在实际提供服务的子进程中创建）
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        get_pf_pool()
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -0,0 +1,212 @@
+"""稀疏牛顿-拉夫逊潮流计算（Numba加速雅可比矩阵填充）
+
+流程与pypower.runpf一致（ext2int -> 形成Ybus -> 牛顿迭代 -> pfsoln -> int2ext），
+其中导纳矩阵由线路参数直接按COO三元组向量化构造为CSR稀疏矩阵，
+牛顿迭代中dS/dV直接在Ybus的CSR结构上逐元素填充，线性方程组用scipy的稀疏LU分解求解。
+"""
+import numpy as np
+from scipy.sparse import csr_matrix, vstack, hstack
+from scipy.sparse.linalg import splu
+
+from pypower.bustypes import bustypes
+from pypower.ext2int import ext2int
+from pypower.int2ext import int2ext
+from pypower.makeSbus import makeSbus
+from pypower.pfsoln import pfsoln
+from pypower.idx_bus import VM, VA, GS, BS
+from pypower.idx_brch import F_BUS, T_BUS, BR_R, BR_X, BR_B, TAP, SHIFT, BR_STATUS, QT
+from pypower.idx_gen import VG, GEN_BUS, GEN_STATUS
+
+# numba为可选依赖，未安装时退化为普通Python函数
+try:
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+# 导纳矩阵缓存：同一进程内网络参数不变的重复计算直接复用Ybus
+_YBUS_CACHE = {}
+_YBUS_CACHE_SIZE = 8
+
+
+def make_ybus_cached(baseMVA, bus, branch):
+    """按影响导纳矩阵的节点/线路参数缓存make_ybus_csr的结果"""
+    key = (
+        baseMVA,
+        bus.shape[0],
+        bus[:, [GS, BS]].tobytes(),
+        branch[:, [F_BUS, T_BUS, BR_R, BR_X, BR_B, TAP, SHIFT, BR_STATUS]].tobytes(),
+    )
+    cached = _YBUS_CACHE.get(key)
+    if cached is None:
+        if len(_YBUS_CACHE) >= _YBUS_CACHE_SIZE:
+            _YBUS_CACHE.pop(next(iter(_YBUS_CACHE)))
+        cached = _YBUS_CACHE[key] = make_ybus_csr(baseMVA, bus, branch)
+    return cached
+
+
+def make_ybus_csr(baseMVA, bus, branch):
+    """由节点/线路参数直接构造CSR格式的Ybus、Yf、Yt（与makeYbus结果一致）"""
+    nb = bus.shape[0]
+    nl = branch.shape[0]
+
+    # 线路π型等值：串联导纳、充电电纳、变比（含移相角）
+    stat = branch[:, BR_STATUS]
+    Ys = stat / (branch[:, BR_R] + 1j * branch[:, BR_X])
+    Bc = stat * branch[:, BR_B]
+    tap = np.where(branch[:, TAP] != 0, branch[:, TAP], 1.0) * np.exp(1j * np.pi / 180 * branch[:, SHIFT])
+
+    Ytt = Ys + 1j * Bc / 2
+    Yff = Ytt / (tap * np.conj(tap))
+    Yft = -Ys / np.conj(tap)
+    Ytf = -Ys / tap
+
+    # 节点并联导纳（保证对角元始终在稀疏结构中）
+    Ysh = (bus[:, GS] + 1j * bus[:, BS]) / baseMVA
+
+    f = branch[:, F_BUS].astype(int)
+    t = branch[:, T_BUS].astype(int)
+    lines = np.arange(nl)
+    buses = np.arange(nb)
+
+    Yf = csr_matrix((np.r_[Yff, Yft], (np.r_[lines, lines], np.r_[f, t])), shape=(nl, nb))
+    Yt = csr_matrix((np.r_[Ytf, Ytt], (np.r_[lines, lines], np.r_[f, t])), shape=(nl, nb))
+    # COO三元组中的重复位置在转换为CSR时自动累加
+    Ybus = csr_matrix(
+        (np.r_[Yff, Yft, Ytf, Ytt, Ysh], (np.r_[f, f, t, t, buses], np.r_[f, t, f, t, buses])),
+        shape=(nb, nb),
+    )
+    return Ybus, Yf, Yt
+
+
+@njit(cache=True)
+def dSbus_dV_csr(Yp, Yi, Yx, V):
+    """计算dS/dVm和dS/dVa，结果与Ybus共用同一套CSR结构（indptr/indices）"""
+    n = len(Yp) - 1
+    Vnorm = V / np.abs(V)
+    Ibus = np.zeros(n, dtype=np.complex128)
+    for r in range(n):
+        for k in range(Yp[r], Yp[r + 1]):
+            Ibus[r] += Yx[k] * V[Yi[k]]
+
+    dS_dVm_x = np.empty(len(Yx), dtype=np.complex128)
+    dS_dVa_x = np.empty(len(Yx), dtype=np.complex128)
+    for r in range(n):
+        for k in range(Yp[r], Yp[r + 1]):
+            c = Yi[k]
+            # dS/dVm = diag(V) * conj(Ybus * diag(Vnorm)) + conj(diag(Ibus)) * diag(Vnorm)
+            dS_dVm_x[k] = V[r] * np.conj(Yx[k] * Vnorm[c])
+            # dS/dVa = 1j * diag(V) * conj(diag(Ibus) - Ybus * diag(V))
+            dS_dVa_x[k] = -1j * V[r] * np.conj(Yx[k] * V[c])
+            if c == r:
+                dS_dVm_x[k] += np.conj(Ibus[r]) * Vnorm[r]
+                dS_dVa_x[k] += 1j * V[r] * np.conj(Ibus[r])
+    return dS_dVm_x, dS_dVa_x
+
+
+def _factor_jacobian(Yp, Yi, Yx, shape, V, pvpq, pq):
+    """形成极坐标形式的雅可比矩阵并做稀疏LU分解"""
+    dS_dVm_x, dS_dVa_x = dSbus_dV_csr(Yp, Yi, Yx, V)
+    dS_dVm = csr_matrix((dS_dVm_x, Yi, Yp), shape=shape)
+    dS_dVa = csr_matrix((dS_dVa_x, Yi, Yp), shape=shape)
+
+    J11 = dS_dVa[pvpq, :][:, pvpq].real
+    J12 = dS_dVm[pvpq, :][:, pq].real
+    J21 = dS_dVa[pq, :][:, pvpq].imag
+    J22 = dS_dVm[pq, :][:, pq].imag
+    J = vstack([hstack([J11, J12]), hstack([J21, J22])], format='csc')
+    return splu(J)
+
+
+def newton_raphson_fast(Ybus, Sbus, V0, pv, pq, tol=1e-8, max_it=10, dishonest=False):
+    """牛顿-拉夫逊法求解潮流，返回 (V, converged, 迭代次数)
+
+    dishonest=True时只在第一次迭代形成并分解雅可比矩阵，之后复用该LU分解
+    （每次迭代更省，但收敛更慢，需要相应增大max_it）。
+    """
+    Ybus = csr_matrix(Ybus)
+    Ybus.sort_indices()
+    Yp, Yi, Yx = Ybus.indptr, Ybus.indices, Ybus.data.astype(np.complex128)
+    shape = Ybus.shape
+
+    V = np.asarray(V0, dtype=np.complex128).copy()
+    Va = np.angle(V)
+    Vm = np.abs(V)
+
+    pvpq = np.r_[pv, pq]
+    npv = len(pv)
+    npq = len(pq)
+    j1, j2 = 0, npv
+    j3, j4 = j2, j2 + npq
+    j5, j6 = j4, j4 + npq
+
+    def mismatch(V):
+        mis = V * np.conj(Ybus * V) - Sbus
+        return np.r_[mis[pv].real, mis[pq].real, mis[pq].imag]
+
+    F = mismatch(V)
+    converged = np.linalg.norm(F, np.inf) < tol
+    i = 0
+    lu = None
+    while not converged and i < max_it:
+        i += 1
+        # 雅可比矩阵奇异（孤立节点、零阻抗线路等）时与pp.runpf一样按不收敛返回
+        try:
+            if lu is None or not dishonest:
+                lu = _factor_jacobian(Yp, Yi, Yx, shape, V, pvpq, pq)
+            dx = -lu.solve(F)
+        except RuntimeError:
+            return V, False, i
+
+        if npv:
+            Va[pv] += dx[j1:j2]
+        if npq:
+            Va[pq] += dx[j3:j4]
+            Vm[pq] += dx[j5:j6]
+        V = Vm * np.exp(1j * Va)
+        Vm = np.abs(V)
+        Va = np.angle(V)
+
+        F = mismatch(V)
+        converged = np.linalg.norm(F, np.inf) < tol
+
+    return V, converged, i
+
+
+def runpf_fast(ppc, tol=1e-8, max_it=10, dishonest=False):
+    """与pp.runpf相同的接口和返回值 (results, success)，使用newton_raphson_fast求解"""
+    ppc = dict(ppc)
+    if ppc['branch'].shape[1] < QT + 1:
+        ppc['branch'] = np.c_[ppc['branch'],
+                              np.zeros((ppc['branch'].shape[0], QT - ppc['branch'].shape[1] + 1))]
+
+    ppc = ext2int(ppc)
+    baseMVA, bus, gen, branch = ppc['baseMVA'], ppc['bus'], ppc['gen'], ppc['branch']
+
+    ref, pv, pq = bustypes(bus, gen)
+    on = np.flatnonzero(gen[:, GEN_STATUS] > 0)  # 在线发电机
+    gbus = gen[on, GEN_BUS].astype(int)  # 发电机所在节点
+
+    # 初始电压，电压控制节点使用发电机电压设定值
+    V0 = bus[:, VM] * np.exp(1j * np.pi / 180 * bus[:, VA])
+    vcb = np.ones(V0.shape)
+    vcb[pq] = 0
+    k = np.flatnonzero(vcb[gbus])
+    V0[gbus[k]] = gen[on[k], VG] / abs(V0[gbus[k]]) * V0[gbus[k]]
+
+    Ybus, Yf, Yt = make_ybus_cached(baseMVA, bus, branch)
+    Sbus = makeSbus(baseMVA, bus, gen)
+
+    V, success, _ = newton_raphson_fast(Ybus, Sbus, V0, pv, pq, tol, max_it, dishonest)
+    bus, gen, branch = pfsoln(baseMVA, bus, gen, branch, Ybus, Yf, Yt, V, ref, pv, pq)
+
+    ppc['success'] = success
+    ppc['bus'], ppc['gen'], ppc['branch'] = bus, gen, branch
+    return int2ext(ppc), success
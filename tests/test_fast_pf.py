@@ -0,0 +1,51 @@
+"""fast_pf.runpf_fast 与 pp.runpf 的结果对比（python -m pytest 运行）"""
+import numpy as np
+import pytest
+
+pp = pytest.importorskip('pypower.api')
+from pypower import case30, case118
+from pypower.idx_bus import VM, VA
+from pypower.idx_brch import F_BUS, T_BUS, PF, QF, PT, QT
+
+from fast_pf import runpf_fast
+
+PPOPT = pp.ppoption(VERBOSE=0, OUT_ALL=0)
+
+
+@pytest.mark.parametrize('case', [case30.case30, case118.case118])
+def test_matches_pypower(case):
+    expected, expected_success = pp.runpf(case(), PPOPT)
+    result, success = runpf_fast(case())
+
+    assert expected_success and success
+    np.testing.assert_allclose(result['bus'][:, VM], expected['bus'][:, VM], atol=1e-8)
+    np.testing.assert_allclose(result['bus'][:, VA], expected['bus'][:, VA], atol=1e-6)
+    np.testing.assert_allclose(result['branch'][:, [PF, QF, PT, QT]],
+                               expected['branch'][:, [PF, QF, PT, QT]], atol=1e-6)
+
+
+def test_branch_without_flow_columns():
+    # 只有QT之前16列的线路矩阵也需要补齐结果列
+    ppc = case30.case30()
+    ppc['branch'] = np.c_[ppc['branch'], np.zeros((ppc['branch'].shape[0], 3))]
+    assert ppc['branch'].shape[1] == QT
+
+    result, success = runpf_fast(ppc)
+    assert success
+    assert result['branch'].shape[1] > QT
+
+
+def test_islanded_bus_not_converged():
+    # 删除26号节点唯一的线路，孤立节点使雅可比矩阵奇异
+    ppc = case30.case30()
+    branch = ppc['branch']
+    ppc['branch'] = branch[(branch[:, F_BUS] != 26) & (branch[:, T_BUS] != 26)]
+
+    result, success = runpf_fast(ppc)
+    assert not success
+    assert result['bus'].shape[0] == 30
+
+
+def test_iteration_limit_not_converged():
+    result, success = runpf_fast(case118.case118(), max_it=1)
+    assert not success
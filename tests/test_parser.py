@@ -0,0 +1,81 @@
+"""MATPOWER .m文件解析回归测试（python -m pytest 运行）"""
+import os
+
+import pytest
+
+import app
+
+BUS_ROW_1 = b'1 3 0 0 0 0 1 1.0 0 345 1 1.1 0.9'
+BUS_ROW_2 = b'2 1 50 20 0 0 1 1.0 0 345 1 1.1 0.9'
+
+
+def test_case9_file():
+    data = app.parse_matpower_file(os.path.join(app.DATA_DIR, 'case9.m'))
+
+    assert data['baseMVA'] == 100.0
+    assert data['bus'].shape == (9, 13)
+    assert data['gen'].shape == (3, 10)
+    assert data['branch'].shape == (9, 13)
+    assert sorted(data['bus_coords']) == list(range(1, 10))
+
+    grid = app.matpower_to_json(data)
+    assert [node['id'] for node in grid['nodes']] == [f'bus{i}' for i in range(1, 10)]
+    assert len(grid['links']) == 9
+
+
+def test_rows_on_one_line():
+    content = (b'mpc.bus = [' + BUS_ROW_1 + b'; ' + BUS_ROW_2 + b'];\n'
+               b'mpc.bus_coords = [1 10 20; 2 30 40];\n')
+    data = app._parse_matpower_content(content)
+
+    assert data['bus'].shape == (2, 13)
+    assert data['bus'][:, 0].tolist() == [1, 2]
+    assert data['bus_coords'] == {1: {'x': 10, 'y': 20}, 2: {'x': 30, 'y': 40}}
+
+
+def test_inline_comments():
+    content = (b'mpc.bus = [\n'
+               b'% bus_i type ...; header\n'
+               b'\t' + BUS_ROW_1 + b';  % slack; first bus\n'
+               b'\t' + BUS_ROW_2 + b'; % load\n'
+               b'];\n')
+    data = app._parse_matpower_content(content)
+
+    assert data['bus'].shape == (2, 13)
+    assert data['bus'][1, 2] == 50
+
+
+def test_crlf_line_endings():
+    content = (b'mpc.baseMVA = 100;\r\n'
+               b'mpc.bus = [\r\n\t' + BUS_ROW_1 + b';\r\n\t' + BUS_ROW_2 + b';\r\n];\r\n')
+    data = app._parse_matpower_content(content)
+
+    assert data['bus'].shape == (2, 13)
+    assert data['bus'][:, 12].tolist() == [0.9, 0.9]
+
+
+def test_function_body_only():
+    # function ... end 之外的同名数据块不参与解析
+    content = (b'function mpc = demo\n'
+               b'mpc.baseMVA = 50;\n'
+               b'mpc.bus = [' + BUS_ROW_1 + b'];\n'
+               b'end\n'
+               b'mpc.bus = [' + BUS_ROW_1 + b'; ' + BUS_ROW_2 + b'];\n')
+    data = app._parse_matpower_content(content)
+
+    assert data['baseMVA'] == 50.0
+    assert data['bus'].shape == (1, 13)
+
+
+def test_empty_blocks():
+    data = app._parse_matpower_content(b'mpc.bus = [\n% no data\n];\nmpc.gen = [];\n')
+
+    assert data['bus'].size == 0
+    assert data['gen'].size == 0
+    assert data['bus_coords'] == {}
+
+
+def test_ragged_rows_raise():
+    content = b'mpc.bus = [' + BUS_ROW_1 + b'; 2 1 50];\n'
+    with pytest.raises(ValueError):
+        app._parse_matpower_content(content)
@@ -0,0 +1,60 @@
+"""run_power_flow 节点/线路结果回写测试（python -m pytest 运行）"""
+import orjson
+import pytest
+
+import app
+
+pytestmark = pytest.mark.skipif(not app.PYPOWER_AVAILABLE, reason='pypower未安装')
+
+
+def _default_grid(rename):
+    grid = orjson.loads(app._DEFAULT_GRID_JSON)
+    for node in grid['nodes']:
+        node['id'] = rename(node['id'])
+    for link in grid['links']:
+        link['source'] = rename(link['source'])
+        link['target'] = rename(link['target'])
+    return grid
+
+
+@pytest.mark.parametrize('rename', [
+    lambda node_id: node_id,
+    lambda node_id: 'bus7' if node_id == 'bus4' else node_id,  # 节点编号不连续
+    lambda node_id: 'n_' + node_id,                             # 节点ID不含编号
+])
+def test_link_flows_follow_node_position(rename):
+    grid = _default_grid(rename)
+    result = app.run_power_flow(grid['nodes'], grid['links'])
+
+    assert result['converged']
+    for link in result['links']:
+        assert 'from_active' in link
+        assert link['active_power'] != 0
+
+
+def _case30():
+    return orjson.loads(app.load_case_data('case30'))
+
+
+def test_method_reports_solver(monkeypatch):
+    grid = _case30()
+    monkeypatch.setattr(app, 'NUMBA_AVAILABLE', True)
+    assert app.run_power_flow(grid['nodes'], grid['links'])['method'] == 'sparse-newton'
+
+    # 未安装numba时大系统也交给PyPower
+    monkeypatch.setattr(app, 'NUMBA_AVAILABLE', False)
+    assert app.run_power_flow(grid['nodes'], grid['links'])['method'] == 'pypower-newton'
+
+
+def test_method_reported_when_solver_raises(monkeypatch):
+    def fail(ppc):
+        raise RuntimeError('solver failed')
+
+    grid = _case30()
+    monkeypatch.setattr(app, 'NUMBA_AVAILABLE', True)
+    monkeypatch.setattr(app, 'runpf_fast', fail)
+    result = app.run_power_flow(grid['nodes'], grid['links'])
+
+    assert not result['converged']
+    assert result['error'] == 'solver failed'
+    assert result['method'] == 'sparse-newton'